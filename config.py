@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Constantes compartilhadas entre a simulação (run_mininet.py) e os
+# utilitários de métricas (metrics.py). Mantê-las em um módulo único evita
+# duplicação e permite que qualquer entrypoint as importe uma vez só.
+from dataclasses import dataclass
+
+ROUTER_SCRIPT = "router_script.py" # Nome do arquivo do daemon
+PORT_BASE = 10000                  # Porta base para o protocolo de roteamento
+CONTROL_BASE = 20000               # Porta base para o soquete de controle (intents)
+NUM_ROUTERS = 5                    # Quantidade de roteadores da topologia
+
+# Id numérico de cada nó, pré-computado uma vez: evita repetir o parse
+# int(name[1:]) em todo lugar que deriva portas a partir do nome do nó.
+NODE_ID = {name: int(name.lstrip("rpc"))
+           for name in [f"r{i}" for i in range(1, NUM_ROUTERS + 1)] + ["pc1", "pc5"]}
+
+@dataclass(frozen=True)
+class LinkSpec:
+    """Parâmetros de um enlace roteador-roteador da topologia."""
+    a: str      # Roteador de uma ponta
+    b: str      # Roteador da outra ponta
+    subnet: str # Sub-rede /24 do enlace
+    delay: str  # Atraso de propagação (formato do TCLink, ex.: "5ms")
+    bw: int     # Banda em Mbit/s
+
+# Tabela única da topologia: é a fonte de verdade tanto para os addLink do
+# Mininet quanto para os metadados repassados aos daemons, em vez de kwargs
+# soltos espalhados pelo código imperativo.
+LINKS = (
+    LinkSpec("r1", "r2", "10.0.12.0/24", "5ms", 20),
+    LinkSpec("r1", "r3", "10.0.13.0/24", "2ms", 40),
+    LinkSpec("r2", "r3", "10.0.23.0/24", "5ms", 50),
+    LinkSpec("r2", "r5", "10.0.25.0/24", "7ms", 80),
+    LinkSpec("r3", "r4", "10.0.34.0/24", "1ms", 200),
+    LinkSpec("r4", "r5", "10.0.45.0/24", "3ms", 150),
+)
+
+# Caminho do arquivo de log de cada roteador, preformatado uma única vez:
+# limpeza, lançamento dos daemons e métricas de overhead compartilham a
+# mesma tabela em vez de cada laço remontar a f-string.
+LOG_PATHS = {name: f"/tmp/{name}.log"
+             for name in NODE_ID if name.startswith("r")}
+
+# Opções do traceroute: 1 sonda por salto, espera de 1s e no máximo 8 saltos.
+# Os padrões (3 sondas, 5s, 30 saltos) custam vários segundos por medição.
+TRACEROUTE_OPTS = "-n -w 1 -q 1 -m 8"
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# Funções de coleta de métricas e testes da simulação.
+#
+# Este módulo é compartilhado pelos entrypoints de simulação: concentrar os
+# helpers aqui evita duplicar o código entre eles e faz o interpretador
+# parsear/compilar as funções uma única vez (bytecode .pyc reutilizável).
+import json, os, subprocess, time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import TRACEROUTE_OPTS, CONTROL_BASE, NODE_ID, LOG_PATHS, LINKS
+
+# Janela TCP do teste de QoS, derivada da tabela de topologia: limite
+# superior do produto banda×atraso entre os caminhos possíveis — o maior
+# gargalo que um caminho pode ter (a maior banda de enlace) vezes o maior
+# RTT possível (ida e volta por todos os enlaces). Janela menor que o BDP do
+# caminho medido limitaria a vazão abaixo da banda real; sobrar janela não
+# atrapalha a medição.
+_QOS_MAX_RTT_S = 2 * sum(int(l.delay.replace('ms', '')) for l in LINKS) / 1000
+_QOS_BDP_BYTES = int(max(l.bw for l in LINKS) * 1e6 / 8 * _QOS_MAX_RTT_S)
+# Mini-traceroute em ICMP puro, executado via 'python3 -c' dentro do namespace
+# do host de origem. Envia 1 echo por TTL e espera 1s pela resposta — sem as
+# 3 sondas redundantes e os timeouts longos do traceroute, e sem subprocesso
+# extra por salto.
+_ICMP_TRACE_SRC = r'''
+import socket, struct, sys
+dest, max_hops = sys.argv[1], int(sys.argv[2])
+def checksum(data):
+    if len(data) % 2: data += b"\0"
+    s = sum(struct.unpack("!%dH" % (len(data)//2), data))
+    s = (s >> 16) + (s & 0xffff); s += s >> 16
+    return (~s) & 0xffff
+sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+sock.settimeout(1.0)
+for ttl in range(1, max_hops + 1):
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_TTL, ttl)
+    header = struct.pack("!BBHHH", 8, 0, 0, ttl, 1)
+    packet = struct.pack("!BBHHH", 8, 0, checksum(header), ttl, 1)
+    sock.sendto(packet, (dest, 0))
+    try:
+        _, addr = sock.recvfrom(512)
+    except socket.timeout:
+        print(f"{ttl}  *")
+        continue
+    print(f"{ttl}  {addr[0]}")
+    if addr[0] == dest:
+        break
+'''
+
+def icmp_trace(host, dest_ip, max_hops=8):
+    """Retorna a saída de um traceroute ICMP enxuto a partir de um host."""
+    p = host.popen(['python3', '-c', _ICMP_TRACE_SRC, dest_ip, str(max_hops)],
+                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, shell=False)
+    out, _ = p.communicate()
+    return out.decode()
+
+def convergence_metric(net, start_time):
+    """Mede o tempo até que todos os nós da rede consigam se pingar."""
+    print("\n*** Aguardando conectividade total da rede (pingall com fail-fast)...")
+    for _ in range(180): # Timeout de 90 segundos
+        if _ping_all_fail_fast(net):
+            end_time = time.time()
+            convergence_time = end_time - start_time
+            # Formata a saída para ser facilmente parseada
+            formatted_result = (
+                f"\n"
+                f"    Tipo: pingall fail-fast\n"
+                f"    Tempo de Convergência: {convergence_time:.4f}sec\n"
+            )
+            print(f"--- METRIC_CONVERGENCE_START ---\n{formatted_result}\n--- METRIC_CONVERGENCE_END ---")
+            break
+        time.sleep(0.5)
+    else:
+        print("*** AVISO: Timeout! Conectividade total não foi estabelecida.")
+
+def _ping_all_fail_fast(net):
+    """Função auxiliar que verifica conectividade total e retorna False se algo falha.
+
+    Em vez de um processo 'ping' por par (O(N²) forks por varredura), dispara
+    um único 'fping' por origem com todos os destinos — o fping envia os echos
+    em lote e reporta o resultado por destino. Os N processos rodam em
+    paralelo, um em cada namespace.
+    """
+    hosts = net.hosts
+    host_ips = {h.name: h.IP() for h in hosts}
+    procs = []
+    for source in hosts:
+        targets = [host_ips[h.name] for h in hosts if h is not source]
+        p = source.popen(['fping', '-c1', '-t1000', '-q'] + targets,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=False)
+        procs.append(p)
+
+    # Colhe os resultados conforme terminam, falhando rápido: na primeira
+    # origem com perda, mata as sondas restantes em vez de esperar seus
+    # timeouts de 1s expirarem.
+    pending = list(procs)
+    failed = False
+    while pending and not failed:
+        still_running = []
+        for p in pending:
+            # fping retorna 0 apenas quando todos os destinos responderam
+            if p.poll() is None:
+                still_running.append(p)
+            elif p.returncode != 0:
+                failed = True
+        pending = still_running
+        if pending and not failed:
+            time.sleep(0.01)
+    for p in pending:
+        p.kill()
+        p.wait()
+    if not failed:
+        print("*** Conectividade total confirmada!")
+    return not failed
+
+def _wait_iperf_server(client, server_ip, port=5201, attempts=50):
+    """Espera o servidor iperf aceitar conexões, em vez de dormir um tempo fixo.
+
+    A sonda precisa rodar dentro do namespace de rede do cliente, então usamos
+    um python3 -c via popen que tenta um connect TCP com timeout curto.
+    """
+    probe = ('import socket,sys; s=socket.socket(); s.settimeout(0.05); '
+             f'sys.exit(0 if s.connect_ex(("{server_ip}",{port}))==0 else 1)')
+    for _ in range(attempts):
+        p = client.popen(['python3', '-c', probe], shell=False)
+        if p.wait() == 0:
+            return True
+        time.sleep(0.02)
+    print("    - AVISO: servidor iperf não respondeu à sonda de conexão.")
+    return False
+
+def qos_metric(pc1, pc5):
+    """Mede a qualidade de serviço (vazão) entre dois PCs usando iperf3."""
+    print("\n*** Realizando teste de desempenho (QoS) com iperf3...")
+    # Servidor em modo daemon com pidfile: um único servidor atende quantas
+    # sondas de QoS a execução fizer e é encerrado pelo pid no final.
+    pc5.cmd('iperf3 -s -D --pidfile /tmp/iperf3.pid')
+    _wait_iperf_server(pc1, pc5.IP(), port=5201)
+    # 4 fluxos paralelos e janela do tamanho do BDP: um único fluxo TCP com a
+    # janela padrão não satura o enlace e subestima a banda disponível.
+    iperf_result = pc1.cmd(f'iperf3 -c {pc5.IP()} -J -t 10 -P 4 -w {_QOS_BDP_BYTES}')
+    try:
+        report = json.loads(iperf_result)
+        summary = report['end']['sum_received']
+        interval = summary['seconds']
+        bytes_transferred = summary['bytes']
+        bandwidth_bps = summary['bits_per_second']
+    except (ValueError, KeyError):
+        print(f"    - AVISO: saída inesperada do iperf3: {iperf_result.strip()[:200]!r}")
+        pc5.cmd('kill $(cat /tmp/iperf3.pid)')
+        return
+    formatted_result = (
+        f"\n"
+        f"    Duração: {interval:.1f}sec\n"
+        f"    Vazão: {bandwidth_bps / 1_000_000:.2f}Mbits/sec\n"
+        f"    Dados Transferidos: {bytes_transferred / (1024*1024):.2f}MBytes\n"
+    )
+    print(f"--- METRIC_QOS_START ---\n{formatted_result}\n--- METRIC_QOS_END ---")
+    pc5.cmd('kill $(cat /tmp/iperf3.pid)') # Para o servidor iperf3
+
+def routing_table_metric(routers):
+    """Coleta e exibe o tamanho da tabela de roteamento de cada roteador."""
+    print("\n*** Coletando métricas de tabela de roteamento...")
+    total_routes = 0
+    routing_table_details = ""
+    for r in routers:
+        # Conta as linhas aqui em vez de encanar para 'wc -l': um exec (ip)
+        # a menos por roteador dentro do namespace
+        route_count = len(r.cmd('ip -4 route show').strip().splitlines())
+        total_routes += route_count
+        routing_table_details += f"    - Roteador {r.name}: {route_count} rotas\n"
+    formatted_result = (
+        f"\n"
+        f"{routing_table_details}"
+        f"    - Total na rede: {total_routes} rotas\n"
+    )
+    print(f"--- METRIC_ROUTING_TABLE_START ---\n{formatted_result}\n--- METRIC_ROUTING_TABLE_END ---")
+
+def path_analysis_metric(pc1, pc5):
+    """Sonda o caminho entre dois hosts com um traceroute ICMP enxuto."""
+    print("\n*** Analisando a rota de pc1 para pc5 (sonda ICMP)...")
+    trace_output = icmp_trace(pc1, pc5.IP())
+    formatted_result = f"\n{trace_output}\n"
+    print(f"--- METRIC_PATH_ANALYSIS_START ---\n{formatted_result}\n--- METRIC_PATH_ANALYSIS_END ---")
+
+def _grep_count(pattern, log_files):
+    """Soma as ocorrências de um padrão nos logs usando grep.
+
+    Um único processo grep varre todos os arquivos (amortizando o custo de
+    startup) com a busca Boyer-Moore/SIMD da libc, bem mais rápida que
+    qualquer varredura por linha em Python para logs grandes.
+    """
+    result = subprocess.run(['grep', '-c', '-F', pattern] + log_files,
+                            capture_output=True, text=True)
+    total = 0
+    for line in result.stdout.splitlines():
+        # Com vários arquivos o grep imprime 'arquivo:contagem'
+        total += int(line.rsplit(':', 1)[-1])
+    return total
+
+def protocol_overhead_metric(routers, start_time):
+    """Analisa os logs para contar pacotes de controle (LSA, HELLO) gerados."""
+    print("\n*** Analisando o overhead do protocolo (pacotes de controle)...")
+    log_files = []
+    for r in routers:
+        log_file = LOG_PATHS[r.name]
+        if os.path.exists(log_file):
+            log_files.append(log_file)
+        else:
+            print(f"    - AVISO: Arquivo de log {log_file} não encontrado.")
+    if log_files:
+        # Um grep por padrão, os dois em paralelo
+        with ThreadPoolExecutor(max_workers=2) as ex:
+            lsa_packets, hello_packets = ex.map(
+                lambda pattern: _grep_count(pattern, log_files),
+                ["Gerando LSA", "Gerando HELLO"])
+    else:
+        lsa_packets = hello_packets = 0
+    time_spent = time.time() - start_time
+    formatted_result = (
+        f"\n"
+        f"      Tempo total: {time_spent:.2f}sec\n"
+        f"      Total gerado de LSA: {lsa_packets}\n"
+        f"      Total gerado de HELLO: {hello_packets}\n"
+    )
+    print(f"--- METRIC_PROTOCOL_OVERHEAD_START ---\n{formatted_result}\n--- METRIC_PROTOCOL_OVERHEAD_END ---")
+
+def _walk_path(net, first_router, dest_ip):
+    """Reconstrói o caminho até dest_ip consultando a tabela de rotas salto a salto.
+
+    Cada 'ip route get' custa milissegundos e não injeta pacotes de sonda na
+    rede (que distorceriam as contagens de overhead), ao contrário de um
+    traceroute completo.
+    """
+    ip_to_router = _router_ip_map(net)
+    path = [first_router]
+    cur = first_router
+    for _ in range(len(net.hosts)): # Limite de saltos para evitar loops
+        out = cur.cmd(f'ip -o route get {dest_ip}')
+        if ' via ' not in out:
+            break # Rota direta: chegou ao roteador de borda do destino
+        next_hop_ip = out.split(' via ')[1].split()[0]
+        next_router = ip_to_router.get(next_hop_ip)
+        if next_router is None or next_router in path:
+            break
+        path.append(next_router)
+        cur = next_router
+    return path
+
+def reconvergence_metric(net, pc1, pc5):
+    """Mede o tempo de reconvergência após derrubar dinamicamente um link."""
+    print("\n*** Medindo o tempo de reconvergência dinamicamente...")
+    # 1. Descobre a rota atual pelas tabelas de roteamento, sem mandar sondas
+    path_routers = _walk_path(net, net.get('r1'), pc5.IP())
+
+    if len(path_routers) < 2:
+        print("    - AVISO: Não foi possível identificar um link para derrubar.")
+        return
+
+    # 2. Derruba o link entre os dois últimos roteadores do caminho
+    r_a, r_b = path_routers[-2], path_routers[-1]
+    print(f"    - Rota identificada: {' -> '.join([r.name for r in path_routers])}")
+    print(f"    - Derrubando o link dinâmico ({r_a.name}-{r_b.name})...")
+    net.configLinkStatus(r_a.name, r_b.name, 'down')
+    start_time = time.time()
+
+    # 3. Espera a conectividade ser restabelecida por uma rota alternativa
+    for _ in range(120):
+        result = pc1.cmd(f'ping -c 1 -W 1 {pc5.IP()}')
+        if '1 received' in result:
+            reconvergence_time = time.time() - start_time
+            # 4. Verifica qual é a nova rota andando pelas tabelas de
+            #    roteamento, sem pagar outro traceroute
+            new_path_routers = _walk_path(net, path_routers[0], pc5.IP())
+            formatted_result = (
+                f"\n"
+                f"    Link derrubado: {r_a.name}-{r_b.name}\n"
+                f"    Tempo para reconvergir: {reconvergence_time:.4f}sec\n"
+                f"    Nova rota identificada: {' -> '.join([r.name for r in new_path_routers])}\n"
+            )
+            print(f"--- METRIC_RECONVERGENCE_START ---\n{formatted_result}\n--- METRIC_RECONVERGENCE_END ---")
+            
+            # 5. Restaura o link original e encerra
+            net.configLinkStatus(r_a.name, r_b.name, 'up')
+            print(f"    - Link {r_a.name}-{r_b.name} restaurado.")
+            return
+        time.sleep(0.5)
+
+    print(f"    - AVISO: Timeout! Ping não foi restabelecido.")
+    net.configLinkStatus(r_a.name, r_b.name, 'up')
+    print(f"    - Link {r_a.name}-{r_b.name} restaurado.")
+
+def _router_ip_map(net):
+    """Mapeia o IP de cada interface de roteador para o nó correspondente."""
+    # intfs.values() evita a lista intermediária que intfList() materializa
+    return {intf.IP(): node
+            for node in net.hosts if node.name.startswith('r')
+            for intf in node.intfs.values()}
+
+def send_intent(router, src, dst, max_latency=None, min_bandwidth=None):
+    """Envia uma mensagem de intent para a porta de controle de um roteador."""
+    msg = {"type": "INTENT", "src": src, "dst": dst,
+           "max_latency": max_latency, "min_bandwidth": min_bandwidth}
+    payload = json.dumps(msg).replace('"', '\\"')
+    # Usa netcat (nc) para enviar a mensagem JSON via UDP
+    router.cmd(f'echo "{payload}" | nc -u -w1 127.0.0.1 {CONTROL_BASE + NODE_ID[router.name]}')
+    print(f"*** Intent enviada para {router.name}: {msg}")
+
+def intent_test(pc1, pc5, net):
+    """Executa uma sequência de testes para validar a funcionalidade intent-aware."""
+    print(f"\n--- TEST_INTENT_AWARE_ROUTING_START ---")
+    print("\n*** Iniciando teste de Intent Aware Routing")
+
+    # Cenário 1: Rota natural, sem nenhuma intent.
+    print(">>> Cenário 1: Sem restrição (rota natural)")
+    print(pc1.cmd(f"traceroute {TRACEROUTE_OPTS} {pc5.IP()}"))
+
+    # Cenário 2: Adiciona uma intent e verifica se a rota muda.
+    print(">>> Cenário 2: Com restrição de latência (max_latency=50ms)")
+    r1 = net.get("r1")
+    send_intent(r1, "pc1", "pc5", min_bandwidth=30)
+    time.sleep(15)  # Espera o roteador processar a intent e a rede convergir
+    print(pc1.cmd(f"traceroute {TRACEROUTE_OPTS} {pc5.IP()}"))
+
+    # Cenário 3: Derruba o link da rota da intent para forçar o fallback.
+    print(">>> Cenário 3: Derrubando link r1–r3 (intent não satisfaz, volta pela rota antiga)")
+    net.configLinkStatus("r1", "r3", "down")
+    time.sleep(15)
+    print(pc1.cmd(f"traceroute {TRACEROUTE_OPTS} {pc5.IP()}"))
+    net.configLinkStatus("r1", "r3", "up") # Restaura o link
+    print(f"Link r1-r3 restaurado.")
+    print(f"--- TEST_INTENT_AWARE_ROUTING_END ---")
+    time.sleep(15) # Espera a rede estabilizar novamente
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse, socket, json, threading, time
+import itertools
 from collections import defaultdict
 import heapq
 import subprocess
@@ -58,16 +59,36 @@ class Router:
         self.port = port_base + int(name[1:])
         # Dicionário para armazenar informações sobre os links diretos
         self.links = {}
+        # Alvos de reenvio da inundação pré-computados por remetente
+        # (chave None = LSA originado localmente)
+        self._forward_to = None
         # Dicionário para redes locais conectadas (com PCs)
         self.stub_networks = {}
         # Mapeia nome do vizinho para sua porta de escuta
         self.peer_ports = {}
         # Link-State Database (LSDB): armazena os LSAs de todos os roteadores da rede
         self.lsdb = {}
+        # Versão do LSDB: incrementada sempre que a topologia anunciada muda.
+        # Permite reaproveitar o grafo derivado enquanto o LSDB está estável.
+        self._lsdb_epoch = 0
+        self._graph_cache = None  # (epoch, grafo) do último _build_graph
+        # Cache de caminhos por intent: as mesmas intents se repetem a cada
+        # recálculo, então o resultado do Dijkstra é reaproveitado enquanto
+        # o LSDB não muda. Limpo junto com a invalidação do grafo.
+        self._path_cache = {}
         # Conjunto de sub-redes diretamente conectadas
         self.connected_subnets = set()
         # Dicionário para rastrear vizinhos ativos e o último HELLO recebido
         self.active_neighbors = {}
+        # Sequência monotônica dos LSAs próprios. Semeada com o timestamp
+        # atual uma única vez (para continuar "mais novo" após um restart),
+        # dispensa uma chamada de relógio por LSA originado.
+        self._lsa_seq = itertools.count(int(time.time()))
+        # Último LSA originado e a "assinatura" dos links que ele anuncia:
+        # enquanto nada muda, o mesmo LSA é reaproveitado em vez de gerar
+        # um novo a cada ciclo.
+        self._last_lsa = None
+        self._last_lsa_key = None
         # Socket para tráfego do protocolo (HELLO, LSA)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.bind(("0.0.0.0", self.port))
@@ -109,6 +130,7 @@ class Router:
         }
         self.peer_ports[peer_name] = int(peer_port)
         self.connected_subnets.add(subnet)
+        self._forward_to = None # Invalida os alvos de inundação pré-computados
 
     def find_router_for_host(self, hostname):
         """
@@ -162,22 +184,63 @@ class Router:
                 self.send_message("HELLO", {"from": self.name}, peer_ip, peer_port, peer_name=peer_name)
 
     def originate_lsa(self):
-        """Cria o LSA deste roteador com base em seus links ativos e redes stub."""
+        """Cria (ou reaproveita) o LSA deste roteador com base em seus links ativos e redes stub."""
         active_peers = self.get_active_neighbors()
         active_links = {peer: self.links[peer] for peer in active_peers if peer in self.links}
-        
+
         # Combina os links com vizinhos e as redes locais (stub) para anunciar tudo
         all_advertised_links = {**active_links, **self.stub_networks}
 
+        # Se o conteúdo anunciado é idêntico ao do último LSA, devolve o mesmo
+        # objeto: sem alocação nova, sem seq novo e sem re-inundação útil —
+        # a otimização clássica de "atualização no-op" do OSPF.
+        key = tuple(sorted(
+            (name, info.get("cost"), info.get("latency"),
+             info.get("bandwidth"), info.get("up", True), info.get("stub", False))
+            for name, info in all_advertised_links.items()))
+        if self._last_lsa is not None and key == self._last_lsa_key:
+            return self._last_lsa
+
         print(f"[{self.name}] Gerando LSA com {len(active_links)} vizinhos ativos e {len(self.stub_networks)} redes stub.")
-        return LSA(self.name, all_advertised_links)
+        self._last_lsa_key = key
+        # Congela o conteúdo anunciado em cópias: os LSAs guardados no LSDB
+        # precisam ser imutáveis. Sem a cópia, o LSA anterior e o novo
+        # compartilhariam os mesmos dicts de self.links, e uma mutação
+        # posterior (ex.: marcar um link como down) deixaria os dois iguais —
+        # _lsdb_store nunca veria a topologia mudar e o grafo e os caminhos
+        # em cache ficariam apontando para o link morto.
+        snapshot = {name: dict(info) for name, info in all_advertised_links.items()}
+        self._last_lsa = LSA(self.name, snapshot, seq=next(self._lsa_seq))
+        return self._last_lsa
+
+    def _rebuild_forward_to(self):
+        """Pré-computa, por remetente, os alvos (vizinho, ip, porta) da inundação.
+
+        Cada vizinho mapeia para a tupla de todos os outros; a chave None
+        cobre LSAs originados localmente. Os links só mudam na configuração
+        inicial, então o caminho quente da inundação vira um lookup de dict
+        mais uma iteração de tupla, sem o teste 'vizinho != remetente' por
+        destino a cada LSA reenviado.
+        """
+        targets = tuple(
+            (peer_name, self.links[peer_name]['peer_ip'], peer_port)
+            for peer_name, peer_port in self.peer_ports.items()
+            if peer_name in self.links)
+        self._forward_to = {None: targets}
+        for peer_name, _, _ in targets:
+            self._forward_to[peer_name] = tuple(t for t in targets
+                                                if t[0] != peer_name)
 
     def flood(self, lsa, from_peer=None):
         """Inunda (envia) um LSA para todos os vizinhos, exceto aquele de quem o recebeu."""
-        for peer_name, peer_port in self.peer_ports.items():
-            if peer_name != from_peer and peer_name in self.links:
-                peer_ip = self.links[peer_name]['peer_ip']
-                self.send_message("LSA", lsa.to_json().decode(), peer_ip, peer_port, peer_name=peer_name)
+        if self._forward_to is None:
+            self._rebuild_forward_to()
+        targets = self._forward_to.get(from_peer)
+        if targets is None:
+            # Remetente desconhecido (não é um vizinho configurado): envia a todos
+            targets = self._forward_to[None]
+        for peer_name, peer_ip, peer_port in targets:
+            self.send_message("LSA", lsa.to_json().decode(), peer_ip, peer_port, peer_name=peer_name)
 
     def get_active_neighbors(self, timeout=15):
         """Verifica quais vizinhos estão ativos. Se um vizinho não envia HELLO por um tempo, é considerado inativo."""
@@ -213,9 +276,10 @@ class Router:
                     from_peer = next((n for n, p in self.peer_ports.items() if (self.links.get(n) and self.links[n]['peer_ip'] == addr[0])), None)
 
                     # Se o LSA é novo ou mais recente que o armazenado, atualiza o LSDB e inunda
-                    if (lsa.origin not in self.lsdb) or (lsa.seq > self.lsdb[lsa.origin].seq):
+                    prev = self.lsdb.get(lsa.origin)
+                    if prev is None or lsa.seq > prev.seq:
                         print(f"[{self.name}] Recebeu novo LSA de {lsa.origin} via {from_peer}. Inundando...")
-                        self.lsdb[lsa.origin] = lsa
+                        self._lsdb_store(lsa)
                         self.flood(lsa, from_peer=from_peer)
                     continue
             except Exception as e:
@@ -228,14 +292,8 @@ class Router:
         """
         print(f"[{self.name}] Atualizando tabela de roteamento...")
         # 1. Constrói um grafo da topologia da rede a partir do LSDB
-        graph = defaultdict(list)
-        for router_name, lsa in self.lsdb.items():
-            for key, metrics in lsa.links.items():
-                # Ignora links para redes stub ou que estão inativos
-                if metrics.get("stub") or not metrics.get("up", True):
-                    continue
-                graph[router_name].append((key, metrics))
-        
+        graph = self._build_graph()
+
         # 2. Identifica todas as sub-redes remotas na rede
         all_remote_subnets = set()
         for lsa in self.lsdb.values():
@@ -304,44 +362,105 @@ class Router:
         except subprocess.CalledProcessError as e:
             print(f"[{self.name}] Erro ao obter tamanho da tabela de roteamento: {e.stderr.strip()}")
 
+    def _lsdb_store(self, lsa):
+        """Armazena um LSA no LSDB, invalidando o grafo em cache se a topologia mudou.
+
+        Trocas de seq com os mesmos links (re-anúncios periódicos) não mudam o
+        grafo, então só o conteúdo dos links conta para a versão do LSDB.
+        """
+        prev = self.lsdb.get(lsa.origin)
+        self.lsdb[lsa.origin] = lsa
+        if prev is None or prev.links != lsa.links:
+            self._lsdb_epoch += 1
+            self._path_cache.clear()
+
+    def _build_graph(self):
+        """Constrói o grafo da topologia a partir do LSDB.
+
+        O grafo é memoizado pela versão do LSDB: enquanto nenhum LSA novo
+        chega (ex.: recálculos disparados por intents), a reconstrução é
+        evitada por completo.
+
+        As arestas são tuplas planas (vizinho, custo, latência, banda) em vez
+        dos dicionários de métricas dos LSAs: o laço interno do Dijkstra só
+        desempacota uma tupla, sem pagar um dict.get por métrica relaxada.
+        """
+        if self._graph_cache is not None and self._graph_cache[0] == self._lsdb_epoch:
+            return self._graph_cache[1]
+        graph = defaultdict(list)
+        for router_name, lsa in self.lsdb.items():
+            for key, metrics in lsa.links.items():
+                # Ignora links para redes stub ou que estão inativos
+                if metrics.get("stub") or not metrics.get("up", True):
+                    continue
+                graph[router_name].append((key,
+                                           metrics.get("cost", 1),
+                                           metrics.get("latency", 0),
+                                           int(metrics.get("bandwidth", 0))))
+        # Congela as listas de adjacência em tuplas: o grafo é somente-leitura
+        # depois de construído, e iterar tuplas é mais barato que listas
+        graph = {node: tuple(edges) for node, edges in graph.items()}
+        self._graph_cache = (self._lsdb_epoch, graph)
+        return graph
+
     def compute_path(self, intent: Intent, graph: dict):
         """
         Calcula o melhor caminho usando um algoritmo similar a Dijkstra.
         A fila de prioridade (pq) armazena (custo, latência, nó, caminho).
         As restrições da intent (latência, banda) são usadas para "podar" caminhos inválidos.
         """
-        # (custo_acumulado, latência_acumulada, nó_atual, caminho_percorrido)
-        pq = [(0, 0, intent.src, [intent.src])]
+        # (custo_acumulado, latência_acumulada, nó_atual). O caminho não entra
+        # na fila: guardar a lista inteira em cada entrada copiava o caminho a
+        # cada relaxamento (O(E*V) de alocações). Em vez disso, registramos o
+        # predecessor de cada nó e reconstruímos o caminho só no destino.
+        # Caminho já calculado para esta intent com o LSDB atual? Os chamadores
+        # só leem o caminho, então a própria lista em cache pode ser devolvida.
+        cache_key = (intent.src, intent.dst, intent.min_bandwidth, intent.max_latency)
+        if cache_key in self._path_cache:
+            return self._path_cache[cache_key]
+
+        # --- Lógica da Intent ---
+        # A restrição de banda é por aresta, então é aplicada uma única vez
+        # aqui, podando o grafo antes do Dijkstra — o laço interno fica sem
+        # esse desvio. A de latência é cumulativa e precisa ficar no laço.
+        if intent.min_bandwidth:
+            min_bw = intent.min_bandwidth
+            graph = {node: tuple(e for e in edges if e[3] >= min_bw)
+                     for node, edges in graph.items()}
+
+        pq = [(0, 0, intent.src)]
         min_costs = {intent.src: 0}
-        
+        predecessor = {intent.src: None}
+
         while pq:
-            cost, latency, node, path = heapq.heappop(pq)
+            cost, latency, node = heapq.heappop(pq)
             if cost > min_costs.get(node, float('inf')):
                 continue
             if node == intent.dst:
-                return path # Chegou ao destino
-
-            for (nbr, metrics) in graph.get(node, []):
-                n_cost = metrics.get("cost", 1)
-                n_lat = metrics.get("latency", 0)
-                n_band = int(metrics.get("bandwidth", 0))
-                
-                # --- Lógica da Intent ---
-                # Se o link não tem a banda mínima, ignora-o
-                if intent.min_bandwidth and n_band < intent.min_bandwidth:
-                    continue
-                
+                # Chegou ao destino: anda pelos predecessores até a origem
+                path = []
+                while node is not None:
+                    path.append(node)
+                    node = predecessor[node]
+                path.reverse()
+                self._path_cache[cache_key] = path
+                return path
+
+            for (nbr, n_cost, n_lat, n_band) in graph.get(node, ()):
                 new_cost = cost + n_cost
                 new_latency = latency + n_lat
                 # Se o caminho acumulado excede a latência máxima, ignora-o
                 if intent.max_latency and new_latency > intent.max_latency:
                     continue
-                
+
                 # Lógica padrão de Dijkstra
                 if new_cost < min_costs.get(nbr, float('inf')):
                     min_costs[nbr] = new_cost
-                    heapq.heappush(pq, (new_cost, new_latency, nbr, path + [nbr]))
-        return None # Caminho não encontrado
+                    predecessor[nbr] = node
+                    heapq.heappush(pq, (new_cost, new_latency, nbr))
+        # Caminho não encontrado: também memoizado, para não repetir a busca
+        self._path_cache[cache_key] = None
+        return None
 
     def run(self):
         """Função principal que inicia e mantém o roteador em execução."""
@@ -356,7 +475,7 @@ class Router:
         while True:
             self.send_hello()
             current_lsa = self.originate_lsa()
-            self.lsdb[self.name] = current_lsa
+            self._lsdb_store(current_lsa)
             self.flood(current_lsa)
             
             print(f"[{self.name}] LSDB contém {len(self.lsdb)} entradas.")